@@ -1,32 +1,63 @@
+import functools
+import hashlib
 import logging
-from collections.abc import Iterable
+import os
+import secrets
+import shutil
+import string
+import sys
+from collections import deque
 from pathlib import Path
-from typing import Annotated
+from typing import TYPE_CHECKING, Annotated
 
-import tomlkit
 from cyclopts import App, Parameter
-from rich.logging import RichHandler
 
-from tomledit.navigate import add_value, del_key, get_mapping, set_or_add, set_value
+from tomledit._syntax import BARE_KEY_CHARS
+
+# tomlkit, rich.logging and our navigate module (which uses tomlkit) are imported
+# where they are needed, so `te --help` does not pay for them.
+if TYPE_CHECKING:
+    import tomlkit
 
 app = App(help_format="markdown", usage="Usage: te [OPTIONS] ARGS")
 logger = logging.getLogger(__name__)
 
 
 def find_in_parents(name: str) -> Path:
-    path = Path().absolute()
-    while not (path / name).exists() and path.parents:
-        path = path.parent
-    file = path / name
-    if file.exists():
-        return file
-    else:
-        return Path(name)
+    return _find_in_parents(Path().absolute(), name)
+
+
+@functools.lru_cache(maxsize=32)
+def _find_in_parents(path: Path, name: str) -> Path:
+    """Cached per working directory, assuming the tree does not change while we run."""
+    for directory in (path, *path.parents):
+        candidate = directory / name
+        if candidate.exists():
+            return candidate
+    return Path(name)
+
+
+def _create_temp_file(target: Path) -> tuple[int, Path]:
+    """
+    Creates a new, uniquely named file next to target and opens it for writing.
+
+    The kernel applies the umask to the file's permissions, like for any new file.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    while True:
+        tmp_file = target.with_name(f"{target.name}.{secrets.token_hex(4)}.tmp")
+        try:
+            return os.open(tmp_file, flags, 0o666), tmp_file
+        except FileExistsError:
+            continue
 
 
 class edit_toml:
-    def __init__(self, filename: str | Path | None, backup: bool = False) -> None:
+    def __init__(
+        self, filename: str | Path | None, backup: bool = False, stdout: bool = False
+    ) -> None:
         self.backup = backup
+        self.stdout = stdout
         if filename is None:
             file = find_in_parents("pyproject.toml")
         elif not isinstance(filename, Path):
@@ -34,49 +65,170 @@ class edit_toml:
         else:
             file = Path(filename)
         self.file = file
-        if self.file.exists():
-            with self.file.open("rb") as f:
-                self.doc = tomlkit.load(f)
-        else:
+        import tomlkit  # noqa: PLC0415
+
+        try:
+            source = self.file.read_bytes()  # one read sized to the file
+        except FileNotFoundError:
+            source = b""
             self.doc = tomlkit.TOMLDocument()
+        else:
+            self.doc = tomlkit.parse(source)
+        self._digest = hashlib.blake2b(source).digest()
 
-    def __enter__(self) -> tomlkit.TOMLDocument:
+    def __enter__(self) -> "tomlkit.TOMLDocument":
         return self.doc
 
     def __exit__(self, exc_type, exc_value, traceback):
-        if self.backup and self.file.exists():
-            backup_file = self.file.with_suffix(self.file.suffix + "~")
-            if backup_file.exists():
-                backup_file.unlink()
-            self.file.rename(backup_file)
-            logger.info("Backup created at %s", backup_file)
-        with self.file.open("w", encoding="utf-8") as f:
-            tomlkit.dump(self.doc, f)
+        import tomlkit  # noqa: PLC0415
+
+        if self.stdout:
+            # don't pass a half-edited document down the pipe
+            if exc_type is None:
+                sys.stdout.write(tomlkit.dumps(self.doc))
+            return
+
+        # serialize up front so the file is written in one go, not token by token
+        data = tomlkit.dumps(self.doc).encode("utf-8")
+        if hashlib.blake2b(data).digest() == self._digest:
+            logger.info("No changes, leaving %s untouched", self.file)
+            return
 
+        # Write to a temporary file first and move it over the original, so the
+        # file is never missing or half-written. Write through symlinks.
+        target = self.file.resolve()
+        try:
+            fd, tmp_file = _create_temp_file(target)
+        except OSError:
+            # E.g., a writable file in a read-only directory. Overwrite the file in
+            # place then, at the risk of leaving it half-written if we are interrupted.
+            self._make_backup(target)
+            with target.open("wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            return
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            if target.exists():
+                shutil.copymode(target, tmp_file)
+                self._make_backup(target)
+            tmp_file.replace(target)
+        except BaseException:
+            tmp_file.unlink(missing_ok=True)
+            raise
 
-def first[T](it: Iterable[T]) -> T:
-    return next(iter(it))
+    def _make_backup(self, target: Path) -> None:
+        if not self.backup or not target.exists():
+            return
+        backup_file = self.file.with_suffix(self.file.suffix + "~")
+        backup_file.unlink(missing_ok=True)
+        try:
+            backup_file.hardlink_to(target)
+        except OSError:  # e.g., no hard links on this file system
+            shutil.copy2(target, backup_file)
+        logger.info("Backup created at %s", backup_file)
 
 
-def parse_key(src: str):
-    structure = tomlkit.parse(f"[{src}]")
-    keys = []
-    while structure:
-        key = first(structure)
-        value = structure[key]
-        if isinstance(value, dict):
-            structure = value
-        keys.append(key)
-    return keys
+_BARE, _BASIC, _LITERAL = range(3)
+_HEX_DIGITS = frozenset(string.hexdigits)
+_ESCAPES = {
+    "b": "\b",
+    "t": "\t",
+    "n": "\n",
+    "f": "\f",
+    "r": "\r",
+    '"': '"',
+    "\\": "\\",
+}
+
+
+@functools.lru_cache(maxsize=256)
+def parse_key(src: str) -> tuple[str, ...]:  # noqa: PLR0912, PLR0915
+    """
+    Splits a dotted TOML key like `super.sub."dotted.key"` into its parts.
+
+    Bare, basic ("…") and literal ('…') key parts are supported, as is whitespace
+    around the dots. Results are cached, so the returned tuple is shared between
+    callers.
+
+    Raises:
+        ValueError: if src is not a valid TOML key.
+    """
+    keys: list[str] = []
+    buffer: list[str] = []
+    state = _BARE
+    part_started = False  # we have seen the first char of the current part
+    part_done = False  # the current part has been terminated by a quote or whitespace
+    i, n = 0, len(src)
+    while i < n:
+        c = src[i]
+        if state == _BASIC:
+            if c == '"':
+                state = _BARE
+                part_done = True
+            elif c == "\\":
+                esc = src[i + 1 : i + 2]
+                if esc in {"u", "U"}:
+                    width = 4 if esc == "u" else 8
+                    digits = src[i + 2 : i + 2 + width]
+                    if len(digits) != width or not _HEX_DIGITS.issuperset(digits):
+                        raise ValueError(f"Invalid unicode escape in key {src!r}")
+                    buffer.append(chr(int(digits, 16)))
+                    i += 1 + width
+                elif esc in _ESCAPES:
+                    buffer.append(_ESCAPES[esc])
+                    i += 1
+                else:
+                    raise ValueError(f"Invalid escape sequence in key {src!r}")
+            else:
+                buffer.append(c)
+        elif state == _LITERAL:
+            if c == "'":
+                state = _BARE
+                part_done = True
+            else:
+                buffer.append(c)
+        elif c == ".":
+            if not part_started:
+                raise ValueError(f"Empty key part in {src!r}")
+            keys.append("".join(buffer))
+            buffer.clear()
+            part_started = part_done = False
+        elif c in " \t":
+            part_done = part_started
+        elif part_done:
+            raise ValueError(f"Unexpected {c!r} in key {src!r}")
+        elif c in {'"', "'"}:
+            if part_started:
+                raise ValueError(f"Unexpected {c!r} in key {src!r}")
+            state = _BASIC if c == '"' else _LITERAL
+            part_started = True
+        elif c in BARE_KEY_CHARS:
+            buffer.append(c)
+            part_started = True
+        else:
+            raise ValueError(f"Invalid character {c!r} in key {src!r}")
+        i += 1
+    if state != _BARE:
+        raise ValueError(f"Unterminated quoted key in {src!r}")
+    if not part_started:
+        raise ValueError(f"Empty key part in {src!r}")
+    keys.append("".join(buffer))
+    return tuple(keys)
 
 
 @app.default()
-def main(  # noqa: PLR0912
+def main(  # noqa: PLR0912, PLR0913, PLR0915
     *args: Annotated[str, Parameter(allow_leading_hyphen=True, required=True)],
     file: Annotated[Path | None, Parameter(["-f", "--file"])] = None,
     find: Annotated[str, Parameter(["-F", "--find"])] = "pyproject.toml",
     prefix: Annotated[str | None, Parameter(["-p", "--prefix"])] = None,
     backup: Annotated[bool, Parameter(["-b", "--backup"])] = False,
+    stdout: Annotated[bool, Parameter(["-o", "--stdout"])] = False,
     verbose: Annotated[bool, Parameter(["-v", "--verbose"])] = False,
 ):
     """
@@ -105,11 +257,23 @@ def main(  # noqa: PLR0912
         find: if _file_ is not given, find a file with this name in the current directory or its parents.
         prefix: if present (e.g., tool.uv), all keys are below this prefix.
         backup: if true, create a backup of the TOML file before writing changes.
+        stdout: if true, write the modified document to stdout and leave the file untouched.
         verbose: report on the operations performed
     """
+    from rich.console import Console  # noqa: PLC0415
+    from rich.logging import RichHandler  # noqa: PLC0415
+
+    from tomledit.navigate import (  # noqa: PLC0415
+        add_value,
+        del_key,
+        get_mapping,
+        set_or_add,
+        set_value,
+    )
+
     logging.basicConfig(
         level=logging.INFO if verbose else logging.WARNING,
-        handlers=[RichHandler(show_time=False)],
+        handlers=[RichHandler(show_time=False, console=Console(stderr=True))],
         format="%(message)s",
     )
     mode_error = {
@@ -124,7 +288,7 @@ def main(  # noqa: PLR0912
     if file is None:
         file = find_in_parents(find)
 
-    with edit_toml(file, backup=backup) as doc:
+    with edit_toml(file, backup=backup, stdout=stdout) as doc:
         if prefix is not None:
             prefix_ = parse_key(prefix)
             root = get_mapping(doc, prefix_)
@@ -134,9 +298,9 @@ def main(  # noqa: PLR0912
             logger.info("Editing %s", file)
 
         mode = "@"
-        commands = list(args)
+        commands = deque(args)
         while commands:
-            command = commands.pop(0)
+            command = commands.popleft()
             if command in modes:
                 mode = command
                 continue
@@ -147,14 +311,14 @@ def main(  # noqa: PLR0912
             elif mode == "++":
                 values = []
                 next_value = ""
-                while commands and (next_value := commands.pop(0)) not in modes:
+                while commands and (next_value := commands.popleft()) not in modes:
                     values.append(next_value)
                 for value in values:
                     add_value(root, key, value)
                 if next_value in modes:
-                    commands.insert(0, next_value)
+                    commands.appendleft(next_value)
             elif commands:
-                value = commands.pop(0)
+                value = commands.popleft()
             else:
                 logger.error(
                     mode_error[mode].format(
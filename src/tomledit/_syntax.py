@@ -0,0 +1,5 @@
+import string
+
+# Characters allowed in bare (unquoted) TOML keys. This module must not import tomlkit,
+# so that the CLI module can use it without loading tomlkit.
+BARE_KEY_CHARS = frozenset(string.ascii_letters + string.digits + "_-")
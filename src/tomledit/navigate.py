@@ -5,15 +5,35 @@ from typing import Any
 
 import tomlkit
 
+from tomledit._syntax import BARE_KEY_CHARS
+
 logger = logging.getLogger(__name__)
 
+# Concrete types for mapping checks, which are much cheaper than checking against the
+# MutableMapping ABC. tomlkit's documents, tables, inline tables and out-of-order table
+# proxies are all dict subclasses.
+_MAPPING_TYPES = (dict,)
+
 
 def format_key(key: Sequence[str]) -> str:
     return ".".join(
-        part if re.match(r"^[A-Za-z0-9_-]+$", part) else f'"{part}"' for part in key
+        part if part and BARE_KEY_CHARS.issuperset(part) else f'"{part}"'
+        for part in key
     )
 
 
+class _LazyKey:
+    """Formats a key only when it is rendered, i.e. when a log record is emitted."""
+
+    __slots__ = ("key",)
+
+    def __init__(self, key: Sequence[str]) -> None:
+        self.key = key
+
+    def __str__(self) -> str:
+        return format_key(self.key)
+
+
 class NoMappingError(TypeError):
     """Raised when a mapping is expected but not found."""
 
@@ -32,6 +52,22 @@ class IntermediateNoMappingError(NoMappingError):
     """Raised when a NoMappingError occurs while navigating to the final key"""
 
 
+# Common scalars are recognized without invoking tomlkit's parser. Only values that
+# tomlkit would serialize exactly as given are handled here, anything else (e.g.,
+# 1_000, +1, 1.50, dates) is left to tomlkit.
+_BOOLEANS = {"true": True, "false": False}
+_INT_RE = re.compile(r"0|-?[1-9][0-9]*")
+_FLOAT_RE = re.compile(r"-?(?:0|[1-9][0-9]*)\.[0-9]+")
+# The first character of any TOML value is one of these
+_VALUE_START = frozenset("\"'[{+-0123456789tfin")
+
+# Strings that are known not to be TOML values, and are thus used as-is. Values that
+# do parse are not cached: tomlkit items carry mutable formatting (comments, whitespace),
+# so they cannot be shared, and copying them is no cheaper than parsing again.
+_plain_strings: set[str] = set()
+_MAX_PLAIN_STRINGS = 1024
+
+
 def make_value(value: Any) -> Any:
     """
     Converts a value to a TOML-compatible value.
@@ -42,9 +78,20 @@ def make_value(value: Any) -> Any:
     Returns:
         Any: A TOML-compatible value.
     """
+    if isinstance(value, str):
+        if value in _BOOLEANS:
+            return _BOOLEANS[value]
+        if _INT_RE.fullmatch(value):
+            return int(value)
+        if _FLOAT_RE.fullmatch(value) and repr(number := float(value)) == value:
+            return number
+        if not value or value[0] not in _VALUE_START or value in _plain_strings:
+            return value
     try:
         return tomlkit.value(value)
     except ValueError:
+        if len(_plain_strings) < _MAX_PLAIN_STRINGS:
+            _plain_strings.add(value)
         return value
 
 
@@ -66,22 +113,25 @@ def get_mapping(
     """
     table = root
     for i, k in enumerate(key):
-        if isinstance(table, MutableMapping):
-            if k not in table:
-                table[k] = {}
-            table = table[k]
-        else:
+        if not isinstance(table, _MAPPING_TYPES):
             raise IntermediateNoMappingError(key[:i], table)
+        if k not in table:
+            # below a newly created table, everything is new, so no more checks needed
+            for new_key in key[i:]:
+                table[new_key] = {}
+                table = table[new_key]
+            break
+        table = table[k]
     return table
 
 
 def set_value(root: MutableMapping[str, Any], key: Sequence[str], value: str) -> None:
     """Sets the value at the specified key in the root dictionary."""
     mapping = get_mapping(root, key[:-1])
-    if isinstance(mapping, MutableMapping):
+    if isinstance(mapping, _MAPPING_TYPES):
         v = make_value(value)
         mapping[key[-1]] = v
-        logger.info("Set %s = %s", format_key(key), v)
+        logger.info("Set %s = %s", _LazyKey(key), v)
     else:
         raise NoMappingError(key[:-1], mapping)
 
@@ -99,18 +149,18 @@ def add_value(root: MutableMapping[str, Any], key: Sequence[str], value: str) ->
         current_value = mapping[key[-1]]
         if isinstance(current_value, list):
             current_value.append(new_value)
-            logger.info("Appended %s to %s", new_value, format_key(key))
+            logger.info("Appended %s to %s", new_value, _LazyKey(key))
         else:
             mapping[key[-1]] = [current_value, new_value]
             logger.info(
                 "At %s, converted %s to a list and added %s",
-                format_key(key),
+                _LazyKey(key),
                 current_value,
                 new_value,
             )
     else:
         mapping[key[-1]] = [new_value]
-        logger.info("Created new list at %s with value %s", format_key(key), new_value)
+        logger.info("Created new list at %s with value %s", _LazyKey(key), new_value)
 
 
 def set_or_add(root: MutableMapping[str, Any], key: Sequence[str], value: str) -> None:
@@ -119,11 +169,16 @@ def set_or_add(root: MutableMapping[str, Any], key: Sequence[str], value: str) -
     otherwise set the entry at the key to the value.
     """
     mapping = get_mapping(root, key[:-1])
-    if key[-1] in mapping and isinstance(mapping[key[-1]], list):
-        mapping[key[-1]].append(make_value(value))
-        logger.info("Appended %s to %s", make_value(value), format_key(key))
+    if not isinstance(mapping, _MAPPING_TYPES):
+        raise NoMappingError(key[:-1], mapping)
+    v = make_value(value)
+    current_value = mapping.get(key[-1])
+    if isinstance(current_value, list):
+        current_value.append(v)
+        logger.info("Appended %s to %s", v, _LazyKey(key))
     else:
-        set_value(mapping, [key[-1]], value)
+        mapping[key[-1]] = v
+        logger.info("Set %s = %s", _LazyKey(key), v)
 
 
 def del_key(root: MutableMapping[str, Any], key: Sequence[str]) -> None:
@@ -135,9 +190,10 @@ def del_key(root: MutableMapping[str, Any], key: Sequence[str]) -> None:
         key (Sequence[str]): The dotted key as it would be used in a TOML document.
     """
     mapping = get_mapping(root, key[:-1])
-    if isinstance(mapping, MutableMapping) and key[-1] in mapping:
-        old_value = mapping[key[-1]]
-        del mapping[key[-1]]
-        logger.info("Deleted %s = %s", format_key(key), old_value)
-    else:
+    if not isinstance(mapping, _MAPPING_TYPES):
         raise NoMappingError(key[:-1], mapping)
+    try:
+        old_value = mapping.pop(key[-1])
+    except KeyError:
+        raise NoMappingError(key[:-1], mapping) from None
+    logger.info("Deleted %s = %s", _LazyKey(key), old_value)
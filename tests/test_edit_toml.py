@@ -0,0 +1,105 @@
+import tomledit
+from tomledit import edit_toml
+
+SAMPLE = """\
+# a comment
+[project]
+name = "sample"  # trailing comment
+dependencies = ["a", "b"]
+"""
+
+
+def test_edit_toml_roundtrip(tmp_path):
+    file = tmp_path / "sample.toml"
+    file.write_text(SAMPLE, encoding="utf-8")
+    with edit_toml(file) as doc:
+        doc["project"]["version"] = "1.0"
+    assert file.read_text(encoding="utf-8") == SAMPLE + 'version = "1.0"\n'
+
+
+def test_edit_toml_backup(tmp_path):
+    file = tmp_path / "sample.toml"
+    file.write_text(SAMPLE, encoding="utf-8")
+    with edit_toml(file, backup=True) as doc:
+        doc["project"]["name"] = "changed"
+    assert (tmp_path / "sample.toml~").read_text(encoding="utf-8") == SAMPLE
+    assert 'name = "changed"' in file.read_text(encoding="utf-8")
+
+
+def test_edit_toml_new_file(tmp_path):
+    file = tmp_path / "new.toml"
+    with edit_toml(file) as doc:
+        doc["key"] = "value"
+    assert file.read_text(encoding="utf-8") == 'key = "value"\n'
+    reference = tmp_path / "reference.toml"
+    reference.touch()
+    assert file.stat().st_mode == reference.stat().st_mode
+
+
+def test_edit_toml_backup_keeps_original_file(tmp_path):
+    file = tmp_path / "sample.toml"
+    file.write_text(SAMPLE, encoding="utf-8")
+    original_inode = file.stat().st_ino
+    with edit_toml(file, backup=True) as doc:
+        doc["project"]["name"] = "changed"
+    assert (tmp_path / "sample.toml~").stat().st_ino == original_inode
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["sample.toml", "sample.toml~"]
+
+
+def test_edit_toml_stdout(tmp_path, capsys):
+    file = tmp_path / "sample.toml"
+    file.write_text(SAMPLE, encoding="utf-8")
+    with edit_toml(file, stdout=True) as doc:
+        doc["project"]["name"] = "changed"
+    assert 'name = "changed"' in capsys.readouterr().out
+    assert file.read_text(encoding="utf-8") == SAMPLE
+    assert [p.name for p in tmp_path.iterdir()] == ["sample.toml"]
+
+
+def test_edit_toml_unchanged(tmp_path):
+    file = tmp_path / "sample.toml"
+    file.write_text(SAMPLE, encoding="utf-8")
+    original_mtime = file.stat().st_mtime_ns
+    with edit_toml(file, backup=True) as doc:
+        doc["project"]["name"] = "sample"
+    assert file.stat().st_mtime_ns == original_mtime
+    assert [p.name for p in tmp_path.iterdir()] == ["sample.toml"]
+
+
+def test_edit_toml_keeps_unrelated_tmp_file(tmp_path):
+    file = tmp_path / "sample.toml"
+    file.write_text(SAMPLE, encoding="utf-8")
+    unrelated = tmp_path / "sample.toml.tmp"
+    unrelated.write_text("keep me", encoding="utf-8")
+    with edit_toml(file) as doc:
+        doc["project"]["name"] = "changed"
+    assert unrelated.read_text(encoding="utf-8") == "keep me"
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "sample.toml",
+        "sample.toml.tmp",
+    ]
+
+
+def test_edit_toml_keeps_mode(tmp_path):
+    file = tmp_path / "sample.toml"
+    file.write_text(SAMPLE, encoding="utf-8")
+    mode = 0o640
+    file.chmod(mode)
+    with edit_toml(file) as doc:
+        doc["project"]["name"] = "changed"
+    assert file.stat().st_mode & 0o777 == mode
+
+
+def test_edit_toml_in_place_without_temp_file(tmp_path, monkeypatch):
+    def no_temp_file(target):
+        raise PermissionError(target.parent)
+
+    monkeypatch.setattr(tomledit, "_create_temp_file", no_temp_file)
+    file = tmp_path / "sample.toml"
+    file.write_text(SAMPLE, encoding="utf-8")
+    original_inode = file.stat().st_ino
+    with edit_toml(file) as doc:
+        doc["project"]["name"] = "changed"
+    assert 'name = "changed"' in file.read_text(encoding="utf-8")
+    assert file.stat().st_ino == original_inode
+    assert [p.name for p in tmp_path.iterdir()] == ["sample.toml"]
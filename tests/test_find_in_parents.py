@@ -0,0 +1,25 @@
+from pathlib import Path
+
+from tomledit import find_in_parents
+
+
+def test_find_in_parents(tmp_path, monkeypatch):
+    (tmp_path / "pyproject.toml").touch()
+    subdir = tmp_path / "a" / "b"
+    subdir.mkdir(parents=True)
+    monkeypatch.chdir(subdir)
+    assert find_in_parents("pyproject.toml") == tmp_path / "pyproject.toml"
+
+
+def test_find_in_parents_missing(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert find_in_parents("no-such-file.toml") == Path("no-such-file.toml")
+
+
+def test_find_in_parents_is_cached(tmp_path, monkeypatch):
+    file = tmp_path / "cached.toml"
+    file.touch()
+    monkeypatch.chdir(tmp_path)
+    assert find_in_parents("cached.toml") == file
+    file.unlink()
+    assert find_in_parents("cached.toml") == file
@@ -0,0 +1,88 @@
+import pytest
+import tomlkit
+
+from tomledit import app
+
+SAMPLE = """\
+[tool.uv.sources]
+foo = { path = "../foo" }
+"""
+
+
+def run(file, *args):
+    app(["-f", str(file), *args], result_action="return_value")
+    return tomlkit.parse(file.read_text(encoding="utf-8"))
+
+
+def test_main_shared_prefix(tmp_path):
+    file = tmp_path / "pyproject.toml"
+    file.write_text(SAMPLE, encoding="utf-8")
+    doc = run(file, "tool.uv.sources.bar", "1", "tool.uv.sources.baz", "2")
+    assert set(doc["tool"]["uv"]["sources"]) == {"foo", "bar", "baz"}
+
+
+def test_main_replaced_table(tmp_path, caplog):
+    file = tmp_path / "pyproject.toml"
+    file.write_text(SAMPLE, encoding="utf-8")
+    doc = run(
+        file,
+        "tool.uv.sources.bar",
+        "1",
+        "tool.uv.sources",
+        "x",
+        "tool.uv.sources.baz",
+        "2",
+    )
+    assert doc["tool"]["uv"]["sources"] == "x"
+    assert "Cannot set or append value 2 for key tool.uv.sources.baz" in caplog.text
+
+
+def test_main_deleted_table(tmp_path):
+    file = tmp_path / "pyproject.toml"
+    file.write_text(SAMPLE, encoding="utf-8")
+    doc = run(
+        file, "tool.uv.sources.bar", "1", "-", "tool.uv", "@", "tool.uv.sources.a", "b"
+    )
+    assert doc["tool"]["uv"] == {"sources": {"a": "b"}}
+
+
+DOTTED = "a.b.c = 1\na.b.d = 2\n"
+OUT_OF_ORDER = "[a.b]\nx = 1\n[c]\ny = 1\n[a.d]\nz = 2\n"
+
+
+def test_main_dotted_delete_twice(tmp_path):
+    file = tmp_path / "f.toml"
+    file.write_text(DOTTED, encoding="utf-8")
+    run(file, "-", "a.b.c", "a.b.d")
+    assert file.read_text(encoding="utf-8") == ""
+
+
+def test_main_dotted_add_twice(tmp_path):
+    file = tmp_path / "f.toml"
+    file.write_text(DOTTED, encoding="utf-8")
+    doc = run(file, "+", "a.b.c", "2", "a.b.c", "3")
+    assert doc["a"]["b"]["c"] == [1, 2, 3]
+
+
+def test_main_out_of_order_extend(tmp_path):
+    file = tmp_path / "f.toml"
+    file.write_text(OUT_OF_ORDER, encoding="utf-8")
+    doc = run(file, "++", "a.b", "x", "y")
+    assert doc["a"]["b"] == [{"x": 1}, "x", "y"]
+
+
+def test_main_out_of_order_set_then_delete(tmp_path):
+    file = tmp_path / "f.toml"
+    file.write_text(OUT_OF_ORDER, encoding="utf-8")
+    doc = run(file, "a.d", "x", "-", "a.d")
+    assert "d" not in doc["a"]
+
+
+def test_main_stdout_error(tmp_path, capsys):
+    file = tmp_path / "pyproject.toml"
+    file.write_text(SAMPLE, encoding="utf-8")
+    args = ["-f", str(file), "-o", "tool.uv.x", "1", "bad key", "2"]
+    with pytest.raises(ValueError, match="bad key"):
+        app(args, result_action="return_value")
+    assert capsys.readouterr().out == ""
+    assert file.read_text(encoding="utf-8") == SAMPLE
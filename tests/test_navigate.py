@@ -1,9 +1,17 @@
+import logging
+
 import pytest
+import tomlkit
 
 from tomledit.navigate import (
     IntermediateNoMappingError,
+    NoMappingError,
     add_value,
+    del_key,
+    format_key,
     get_mapping,
+    make_value,
+    set_or_add,
     set_value,
 )
 
@@ -92,3 +100,100 @@ def test_add_value_new_list():
     value = "new_value"
     add_value(root, key, value)
     assert root["a"]["b"] == [value]
+
+
+def test_format_key():
+    assert format_key(["tool", "uv", "sources"]) == "tool.uv.sources"
+    assert format_key(["a", "dotted.key", "b-c_1"]) == 'a."dotted.key".b-c_1'
+    assert format_key(["", "ä"]) == '""."ä"'
+
+
+def test_set_value_logs_formatted_key(caplog):
+    with caplog.at_level(logging.INFO, logger="tomledit.navigate"):
+        set_value({}, ["a", "b.c"], "x")
+    assert 'Set a."b.c" = x' in caplog.messages
+
+
+def test_set_or_add_appends_to_list():
+    root = {"a": ["b"]}
+    set_or_add(root, ["a"], "c")
+    assert root["a"] == ["b", "c"]
+
+
+def test_set_or_add_sets_value():
+    root = {"a": {"b": "old"}}
+    set_or_add(root, ["a", "b"], "new")
+    assert root["a"]["b"] == "new"
+
+
+def test_make_value_returns_fresh_items():
+    assert make_value("README.md") == "README.md"
+    assert make_value("README.md") == "README.md"
+    first, second = make_value("[1, 2]"), make_value("[1, 2]")
+    assert first == second
+    assert first is not second
+
+
+def test_get_mapping_creates_tomlkit_tables():
+    doc = tomlkit.parse("[a]\nx = 1\n")
+    result = get_mapping(doc, ["a", "b", "c"])
+    result["y"] = "z"
+    assert doc["a"]["b"]["c"]["y"] == "z"
+
+
+def test_set_value_out_of_order_table():
+    doc = tomlkit.parse("[a.b]\nx = 1\n[c]\n[a.d]\ny = 2\n")
+    set_value(doc, ["a", "d", "z"], "new")
+    assert doc["a"]["d"]["z"] == "new"
+
+
+def test_set_value_tuple_key():
+    root = {"a": {}}
+    set_value(root, ("a", "b"), "x")
+    assert root == {"a": {"b": "x"}}
+
+
+def test_set_or_add_no_mapping():
+    root = {"a": "not_a_dict"}
+    with pytest.raises(NoMappingError):
+        set_or_add(root, ["a", "b"], "x")
+
+
+def test_set_or_add_logs_full_key(caplog):
+    with caplog.at_level(logging.INFO, logger="tomledit.navigate"):
+        set_or_add({}, ["a", "b"], "x")
+    assert "Set a.b = x" in caplog.messages
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        *["true", "false", "0", "-0", "42", "-7", "+1", "1_000"],
+        *["1.5", "-0.25", "1.50", "1e5", "inf", "nan", "1979-05-27"],
+        *['"quoted"', "README.md", "*.pyw", ""],
+    ],
+)
+def test_make_value_serializes_like_tomlkit(value):
+    try:
+        expected = tomlkit.value(value)
+    except ValueError:
+        expected = value
+    assert tomlkit.dumps({"k": make_value(value)}) == tomlkit.dumps({"k": expected})
+
+
+def test_del_key():
+    root = {"a": {"b": "x", "c": "y"}}
+    del_key(root, ["a", "b"])
+    assert root == {"a": {"c": "y"}}
+
+
+def test_del_key_missing():
+    root = {"a": {}}
+    with pytest.raises(NoMappingError):
+        del_key(root, ["a", "b"])
+
+
+def test_del_key_tomlkit():
+    doc = tomlkit.parse('[a]\nb = "x"  # comment\nc = "y"\n')
+    del_key(doc, ["a", "b"])
+    assert doc.as_string() == '[a]\nc = "y"\n'
@@ -0,0 +1,48 @@
+import pytest
+import tomlkit
+
+from tomledit import parse_key
+
+
+def parse_key_tomlkit(src: str) -> tuple[str, ...]:
+    """Reference implementation of `parse_key` using the full TOML parser."""
+    structure = tomlkit.parse(f"[{src}]")
+    keys = []
+    while structure:
+        key = next(iter(structure))
+        value = structure[key]
+        if isinstance(value, dict):
+            structure = value
+        keys.append(key)
+    return tuple(keys)
+
+
+@pytest.mark.parametrize(
+    "src",
+    [
+        "a",
+        "a.b.c",
+        "tool.uv.sources",
+        "a . b",
+        ' a."b.c" ',
+        "'x\\y'.z",
+        '"a\\u00e4\\U0001F600"',
+        '"tab\\there"',
+        'a.""',
+        "bare-key_1.'literal \"quoted\"'",
+    ],
+)
+def test_parse_key_matches_tomlkit(src):
+    assert parse_key(src) == parse_key_tomlkit(src)
+
+
+@pytest.mark.parametrize(
+    "src", ["", "a..b", "a.", ".a", "a b", '"unterminated', '"bad\\q"', "a.b$"]
+)
+def test_parse_key_invalid(src):
+    with pytest.raises(ValueError):  # noqa: PT011
+        parse_key(src)
+
+
+def test_parse_key_is_cached():
+    assert parse_key("tool.uv.sources") is parse_key("tool.uv.sources")